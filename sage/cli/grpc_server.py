@@ -1,7 +1,7 @@
 # grpc_server.py
 # Author: Thomas MINIER - MIT License 2017-2020
 import signal
-from asyncio import set_event_loop_policy
+from asyncio import get_event_loop, set_event_loop_policy
 from os.path import isfile
 from time import time
 
@@ -11,10 +11,10 @@ import uvloop
 from sage.grpc.grpc_server import get_server
 
 
-def stop_server(server, grace=None):
+def stop_server(server, loop, grace=None):
   """Stop server on a CTRL-C event"""
-  def __fn__(signum, frame):
-    server.stop(grace)
+  def __fn__():
+    loop.create_task(server.stop(grace))
   return __fn__
 
 @click.command()
@@ -27,10 +27,11 @@ def start_grpc_server(config: str, port: int, workers: int, log_level: str) -> N
   # Enable uvloop
   set_event_loop_policy(uvloop.EventLoopPolicy())
 
+  loop = get_event_loop()
   server = get_server(config, port=port, workers=workers)
   # Stop the server on a CTRL-C event
-  signal.signal(signal.SIGINT, stop_server(server))
+  loop.add_signal_handler(signal.SIGINT, stop_server(server, loop))
 
   # Start the server, and wait until it completes
-  server.start()
-  server.wait_for_termination()
+  loop.run_until_complete(server.start())
+  loop.run_until_complete(server.wait_for_termination())
@@ -68,9 +68,9 @@ def init_postgres(config, graph_name, index):
 
     cursor = connection.cursor()
     # create the main SQL table
-    logger.info("Creating SQL table {}...".format(table_name))
+    logger.info(f"Creating SQL table {table_name}...")
     cursor.execute(create_table_query)
-    logger.info("SPARQL table {} successfully created".format(table_name))
+    logger.info(f"SPARQL table {table_name} successfully created")
 
     # create the additional inexes on OSP and POS
     if index:
@@ -86,7 +86,7 @@ def init_postgres(config, graph_name, index):
     connection.commit()
     cursor.close()
     connection.close()
-    logger.info("Sage PostgreSQL model for table {} successfully initialized".format(table_name))
+    logger.info(f"Sage PostgreSQL model for table {table_name} successfully initialized")
 
 
 @click.command()
@@ -121,14 +121,14 @@ def index_postgres(config, graph_name):
     for q in create_indexes_queries:
         cursor.execute(q)
     stop = time()
-    logger.info("Additional B-tree indexes successfully created in {}s".format(stop - start))
+    logger.info(f"Additional B-tree indexes successfully created in {stop - start}s")
 
     # commit and cleanup connection
     logger.info("Committing and cleaning up...")
     connection.commit()
     cursor.close()
     connection.close()
-    logger.info("Sage PostgreSQL model for table {} successfully initialized".format(table_name))
+    logger.info(f"Sage PostgreSQL model for table {table_name} successfully initialized")
 
 
 @click.command()
@@ -168,7 +168,7 @@ def put_postgres(config, graph_name, rdf_file, format, block_size, commit_thresh
 
     logger.info("Reading RDF source file...")
     iterator, nb_triples = get_rdf_reader(rdf_file, format=format)
-    logger.info("RDF source file loaded. Found ~{} RDF triples to ingest.".format(nb_triples))
+    logger.info(f"RDF source file loaded. Found ~{nb_triples} RDF triples to ingest.")
 
     logger.info("Starting RDF triples ingestion...")
     cursor = connection.cursor()
@@ -178,7 +178,7 @@ def put_postgres(config, graph_name, rdf_file, format, block_size, commit_thresh
     to_commit = 0
     # insert by bucket (and show a progress bar)
     with click.progressbar(length=nb_triples,
-                           label="Inserting RDF triples".format(nb_triples)) as bar:
+                           label="Inserting RDF triples") as bar:
         for bucket in bucketify(iterator, block_size):
             to_commit += len(bucket)
             # bulk load the bucket of RDF triples, then update progress bar
@@ -191,18 +191,18 @@ def put_postgres(config, graph_name, rdf_file, format, block_size, commit_thresh
                 # logger.info("All changes were successfully committed.")
                 to_commit = 0
     end = time()
-    logger.info("RDF triples ingestion successfully completed in {}s".format(end - start))
+    logger.info(f"RDF triples ingestion successfully completed in {end - start}s")
 
     # run an ANALYZE query to rebuild statistics
     logger.info("Rebuilding table statistics...")
     start = time()
-    cursor.execute("ANALYZE {}".format(table_name))
+    cursor.execute(f"ANALYZE {table_name}")
     end = time()
-    logger.info("Table statistics successfully rebuilt in {}s".format(end - start))
+    logger.info(f"Table statistics successfully rebuilt in {end - start}s")
 
     # commit and cleanup connection
     logger.info("Committing and cleaning up...")
     connection.commit()
     cursor.close()
     connection.close()
-    logger.info("RDF data from file '{}' successfully inserted into RDF graph '{}'".format(rdf_file, table_name))
+    logger.info(f"RDF data from file '{rdf_file}' successfully inserted into RDF graph '{table_name}'")
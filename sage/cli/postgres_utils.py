@@ -72,5 +72,5 @@ def get_postgres_insert_into(table_name, enable_mvcc=False):
         Get an INSERT INTO query compatible with `psycopg2.extras.execute_values` (to support bulk loading).
     """
     if enable_mvcc:
-        return "INSERT INTO {} (subject,predicate,object) VALUES %s".format(table_name)
-    return "INSERT INTO {} (subject,predicate,object) VALUES %s".format(table_name)
+        return f"INSERT INTO {table_name} (subject,predicate,object) VALUES %s"
+    return f"INSERT INTO {table_name} (subject,predicate,object) VALUES %s"
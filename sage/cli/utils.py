@@ -23,11 +23,11 @@ def load_graph(config_path, graph_name, logger, backends=[]):
                 kind = g['backend']
                 break
         if graph is None:
-            logger.error("No compatible RDF graph named '{}' declared in the configuration provided".format(graph_name))
+            logger.error(f"No compatible RDF graph named '{graph_name}' declared in the configuration provided")
             exit(1)
         return graph, kind
     else:
-        logger.error("Invalid configuration file supplied '{}'".format(config_path))
+        logger.error(f"Invalid configuration file supplied '{config_path}'")
         exit(1)
 
 
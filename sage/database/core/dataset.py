@@ -92,7 +92,7 @@ class Dataset(object):
         Returns:
           The RDF Graph associated with the URUI or None if it was not found.
         """
-        return self._graphs[graph_uri] if graph_uri in self._graphs else None
+        return self._graphs.get(graph_uri)
 
     def has_graph(self, graph_uri: str) -> bool:
         """Test if a RDF graph exists in the RDF dataset.
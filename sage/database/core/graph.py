@@ -1,8 +1,9 @@
 # graph.py
 # Author: Thomas MINIER - MIT License 2017-2020
+from contextlib import contextmanager
 from datetime import datetime
 from math import inf
-from typing import List, Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 from sage.database.db_connector import DatabaseConnector
 from sage.database.db_iterator import DBIterator
@@ -30,6 +31,9 @@ class Graph(object):
         self._quantum = quantum
         self._max_results = max_results
         self._example_queries = default_queries
+        # index example queries by ID, as they do not change once the graph is loaded.
+        # Queries are indexed in reverse order, so the first query with a given ID wins.
+        self._example_queries_by_id = {query["@id"]: query for query in reversed(default_queries) if "@id" in query}
     
     @property
     def uri(self) -> str:
@@ -112,6 +116,23 @@ class Graph(object):
         """Abort any ongoing transaction (at the database level)."""
         self._connector.abort_transaction()
 
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Run a block of code in a transaction (at the database level).
+
+        The transaction is committed if the block completes, and aborted if either the block or the commit raises an exception, which is then propagated.
+
+        Example:
+          >>> with graph.transaction():
+          >>>   graph.insert(s, p, o)
+        """
+        try:
+            yield
+            self.commit()
+        except Exception:
+            self.abort()
+            raise
+
     def describe(self, url: str) -> dict:
         """Describe the RDF Dataset in JSON-LD format."""
         return {
@@ -135,7 +156,4 @@ class Graph(object):
 
     def get_query(self, q_id: str) -> Optional[str]:
         """Get an example SPARQL query associated with the graph, or None if it was not found"""
-        for query in self.example_queries:
-            if query['@id'] == q_id:
-                return query
-        return None
+        return self._example_queries_by_id.get(q_id)
@@ -120,7 +120,7 @@ def load_config(config_file: str, format="ttl") -> Dataset:
         if row.name is None:
             raise SyntaxError("A valid SaGe RDF graph must have a name (declared using foaf:name)!")
         g_name = row.name
-        g_description = row.desc if row.desc is not None else "Unnamed RDF graph with id {}".format(g_name)
+        g_description = row.desc if row.desc is not None else f"Unnamed RDF graph with id {g_name}"
         g_quantum = row.quantum if row.quantum is not None else quantum
         g_max_results = row.pageSize if row.pageSize is not None else max_results
 
@@ -149,6 +149,6 @@ def load_config(config_file: str, format="ttl") -> Dataset:
                 continue
             # build the graph and register it
             graphs[g_name] = Graph(g_name, g_description, g_connector, quantum=g_quantum, max_results=g_max_results, default_queries=g_queries)
-            logging.info("RDF Graph '{}' (backend: {}) successfully loaded".format(g_name, backend_name))
+            logging.info(f"RDF Graph '{g_name}' (backend: {backend_name}) successfully loaded")
 
     return Dataset(dataset_name, dataset_description, graphs, public_url=public_url, default_query=default_query, analytics=analytics)
@@ -12,21 +12,21 @@ class HashMapManager(StatefullManager):
         super(HashMapManager, self).__init__()
         self._plans = dict()
 
-    def get_plan(self, plan_id: str) -> str:
+    def get_plan(self, plan_id: str) -> bytes:
         """Get a saved plan by ID.
         
         Argument: ID of the saved plan to retrieve.
 
-        Returns: The saved plan corresponding to the input ID.
+        Returns: The saved plan corresponding to the input ID, serialized as a Protobuf message.
         """
         return self._plans[plan_id]
 
-    def save_plan(self, id: str, plan: str) -> None:
+    def save_plan(self, id: str, plan: bytes) -> None:
         """Store a saved plan by ID.
         
         Args:
           * id: Unique ID associated with the saved plan.
-          * plan: Plan to save.
+          * plan: Plan to save, serialized as a Protobuf message.
         """
         self._plans[id] = plan
 
@@ -61,19 +61,20 @@ class SageClient(object):
         >>>   print(bindings)
     """
     client = service_pb2_grpc.SageSPARQLStub(self._channel)
-    grpc_query = SageQuery(query = query, default_graph_uri = default_graph_uri)
+    grpc_query = SageQuery(query = sparql_query, default_graph_uri = default_graph_uri)
     is_done = False
     next_link = None
     while not is_done:
-      response = client.Query(grpc_query)
+      # results are streamed by chunks, and the last chunk holds the state of the query execution
+      for response in client.Query(grpc_query):
+        # yield solution mappings in dict format
+        for binding in response.bindings:
+          results = dict()
+          for mu in binding.values:
+            results[mu.variable] = mu.value
+          yield results
       # prepare next query
       is_done = response.is_done
       next_link = response.next_link
-      grpc_query = SageQuery(query = query, default_graph_uri = default_graph_uri, next_link = next_link)
-      # yield solution mappings in dict format
-      for binding in response.bindings:
-        results = dict()
-        for mu in binding.values:
-          results[mu.variable] = mu.value
-        yield results
+      grpc_query = SageQuery(query = sparql_query, default_graph_uri = default_graph_uri, next_link = next_link)
       
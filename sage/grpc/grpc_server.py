@@ -1,129 +1,136 @@
 # grpc_server.py
 # Author: Thomas MINIER - MIT License 2017-2020
 import logging
-from asyncio import run
-from concurrent.futures import ThreadPoolExecutor
-from time import time
-from typing import Dict, List, Iterable
-from uuid import uuid4
+from secrets import token_urlsafe
+from typing import AsyncIterable, Dict, List
 
 import grpc
+import grpc.aio
+from google.protobuf.internal import api_implementation
 
 from sage.database.core.dataset import Dataset
-from sage.database.core.graph import Graph
 from sage.database.core.yaml_config import load_config
 from sage.grpc import service_pb2_grpc
-from sage.grpc.service_pb2 import Binding, BindingSet, SageQuery, SageResponse
+from sage.grpc.service_pb2 import SageQuery, SageResponse
 from sage.http_server.utils import decode_saved_plan, encode_saved_plan
 from sage.query_engine.iterators.loader import load
 from sage.query_engine.optimizer.query_parser import parse_query
 from sage.query_engine.sage_engine import SageEngine
 
 
-def create_bindings(bindings: List[Dict[str, str]]) -> Iterable[BindingSet]:
-  """Create an iterator that converts a set of dict-based bindings to a set of protobuf-based bindings.
-  
-  Argument: List of solutions bindings, encoded as dictionaries.
+def add_bindings(response: SageResponse, bindings: List[Dict[str, str]]) -> None:
+  """Convert a set of dict-based bindings to protobuf-based bindings, directly inside a SageResponse.
 
-  Yields: Set of solutions bindings, encoded in a Protobuf format.
+  Bindings are built in place in the response's repeated fields, so they are not copied once more when attached to the response.
+  
+  Args:
+    * response: SageResponse to which solutions bindings are added.
+    * bindings: List of solutions bindings, encoded as dictionaries.
   """
   for binding in bindings:
-    binding_set = BindingSet()
+    binding_set = response.bindings.add()
     for variable, value in binding.items():
-      binding_set.values.append(Binding(variable = variable, value = value))
-    yield binding_set
+      binding_set.values.add(variable = variable, value = value)
 
 
 class SageQueryService(service_pb2_grpc.SageSPARQLServicer):
   """A SageQueryService implements a gRPC service that evaluates SPARQL queries using Web preemption
+
+  Query results are streamed to the client as a sequence of SageResponse chunks, so the encoding of a chunk overlaps with the transfer of the previous ones.
+  Queries are executed asynchronously on the event loop of the gRPC server, so the executions of concurrent queries are interleaved with network I/O.
   
-  Argument: RDF dataset hosted by the gRPC server.
+  Args:
+    * dataset: RDF dataset hosted by the gRPC server.
+    * chunk_size: Maximum number of solution bindings sent per SageResponse chunk.
   """
 
-  def __init__(self, dataset: Dataset):
+  def __init__(self, dataset: Dataset, chunk_size: int = 500):
     super(SageQueryService).__init__()
     self._dataset = dataset
     self._engine = SageEngine()
+    self._chunk_size = chunk_size
   
-  def Query(self, request: SageQuery, context: grpc.ServicerContext) -> SageResponse:
-    graph: Graph = None
+  async def Query(self, request: SageQuery, context: grpc.aio.ServicerContext) -> AsyncIterable[SageResponse]:
+    query = request.query
+    graph_name = request.default_graph_uri
+    next_link = request.next_link if len(request.next_link) > 0 else None
+    graph = self._dataset.get_graph(graph_name)
+    if graph is None:
+      await context.abort(grpc.StatusCode.NOT_FOUND, details=f"RDF Graph {graph_name} not found on the server.")
     try:
-      query = request.query
-      graph_name = request.default_graph_uri
-      next_link = request.next_link if len(request.next_link) > 0 else None
-      if not self._dataset.has_graph(graph_name):
-        context.abort(code=404, details=f"RDF Graph {graph_name} not found on the server.")
-      graph = self._dataset.get_graph(graph_name)
-
-      # decode next_link or build query execution plan
-      cardinalities = dict()
-      start = time()
-      if next_link is not None:
-        if self._dataset.is_stateless:
-            saved_plan = next_link
+      # any failure aborts the ongoing transactions
+      with graph.transaction():
+        # decode next_link or build query execution plan
+        if next_link is not None:
+          if self._dataset.is_stateless:
+              saved_plan = decode_saved_plan(next_link)
+          else:
+              saved_plan = self._dataset.statefull_manager.get_plan(next_link)
+          plan = load(saved_plan, self._dataset)
         else:
-            saved_plan = self._dataset.statefull_manager.get_plan(next_link)
-        plan = load(decode_saved_plan(saved_plan), self._dataset)
-      else:
-        plan, cardinalities = parse_query(query, self._dataset, graph_name)
-      loading_time = (time() - start) * 1000
-
-      # execute query
-      engine = SageEngine()
-      quota = graph.quota / 1000
-      max_results = graph.max_results
-      bindings, saved_plan, is_done, abort_reason = run(engine.execute(plan, quota, max_results))
-
-      # commit or abort (if necessary)
-      if abort_reason is not None:
-        graph.abort()
-        context.abort(code=500, details=f"The SPARQL query has been aborted for the following reason: '{abort_reason}'")
-      else:
-        graph.commit()
-
-      # encode saved plan if query execution is not done yet and there was no abort
-      start = time()
-      next_page = None
-      if (not is_done) and abort_reason is None:
-        next_page = encode_saved_plan(saved_plan)
-        if not self._dataset.is_stateless:
-          # generate the plan ID if this is the first time we execute this plan
-          plan_id = next_link if next_link is not None else str(uuid4())
-          self._dataset.statefull_manager.save_plan(plan_id, next_page)
-          next_page = plan_id
-      elif is_done and (not self._dataset.is_stateless) and next_link is not None:
-        # delete the saved plan, as it will not be reloaded anymore
-        self._dataset.statefull_manager.delete_plan(next_link)
-      exportTime = (time() - start) * 1000
-
-      # create response
+          plan, _ = parse_query(query, self._dataset, graph_name)
+
+        # execute query
+        quota = graph.quota / 1000
+        max_results = graph.max_results
+        bindings, saved_plan, is_done, abort_reason = await self._engine.execute(plan, quota, max_results)
+
+        # abort (if necessary)
+        if abort_reason is not None:
+          await context.abort(grpc.StatusCode.ABORTED, details=f"The SPARQL query has been aborted for the following reason: '{abort_reason}'")
+
+        # encode saved plan if query execution is not done yet
+        next_page = None
+        if not is_done:
+          if self._dataset.is_stateless:
+            next_page = encode_saved_plan(saved_plan)
+          else:
+            # generate the plan ID if this is the first time we execute this plan
+            plan_id = next_link if next_link is not None else token_urlsafe(16)
+            # saved plans never leave the server in statefull mode, so they are stored without base64 encoding
+            self._dataset.statefull_manager.save_plan(plan_id, saved_plan.SerializeToString())
+            next_page = plan_id
+        elif (not self._dataset.is_stateless) and next_link is not None:
+          # delete the saved plan, as it will not be reloaded anymore
+          self._dataset.statefull_manager.delete_plan(next_link)
+
+      # stream the solution bindings by chunks, the last one holds the state of the query execution
+      last_chunk = max(len(bindings) - 1, 0) // self._chunk_size * self._chunk_size
+      for offset in range(0, last_chunk, self._chunk_size):
+        response = SageResponse()
+        add_bindings(response, bindings[offset:offset + self._chunk_size])
+        yield response
       response = SageResponse(is_done = is_done, next_link = next_page)
-      for binding in create_bindings(bindings):
-        response.bindings.append(binding)
-      return response
+      add_bindings(response, bindings[last_chunk:])
+      yield response
+    except grpc.aio.AbortError:
+      raise
     except Exception as err:
-      if graph is not None:
-        graph.abort()
-      context.abort(code=500, details=f"A server-side error has occurred: {str(err)}")
+      await context.abort(grpc.StatusCode.INTERNAL, details=f"A server-side error has occurred: {str(err)}")
+
 
+def get_server(config_file: str, port=8000, workers=10) -> grpc.aio.Server:
+  """Create a SaGe SPARQL query server powered by gRPC AsyncIO.
 
-def get_server(config_file: str, port=8000, workers=10) -> grpc.Server:
-  """Create a SaGe SPARQL query server powered by gRPC.
+  The server must be created, started and stopped from the same asyncio event loop.
   
   Args:
     * config_file: Path to the SaGe configuration file, in YAML format.
     * port: Host port to run the gRPC server.
-    * workers: Number of thread workers used by the gRPC server.
+    * workers: Unused, as queries are executed on the event loop of the server. Kept for backward compatibility.
   
   Returns:
     A SaGe gRPC server built from the input configuration file.
   """
   logging.basicConfig()
+  # the pure-Python protobuf runtime encodes messages field by field, which dominates the cost of large responses
+  if api_implementation.Type() == "python":
+    logging.warning("The pure-Python protobuf runtime is in use, which slows down gRPC (de)serialization. Install a protobuf package that ships the C++ extension (or set PROTOCOL_BUFFERS_PYTHON_IMPLEMENTATION=cpp) for better performance.")
 
   dataset = load_config(config_file)
   service = SageQueryService(dataset)
 
-  server = grpc.server(ThreadPoolExecutor(max_workers=10))
+  server = grpc.aio.server()
   service_pb2_grpc.add_SageSPARQLServicer_to_server(service, server)
   
   server.add_insecure_port(f'[::]:{port}')
@@ -20,7 +20,7 @@ DESCRIPTOR = _descriptor.FileDescriptor(
   package='sage',
   syntax='proto3',
   serialized_options=_b('\n\026fr.univnantes.gdd.sageB\nSageSPARQLP\001\242\002\003HLW'),
-  serialized_pb=_b('\n\rservice.proto\x12\x04sage\"H\n\tSageQuery\x12\r\n\x05query\x18\x01 \x01(\t\x12\x19\n\x11\x64\x65\x66\x61ult_graph_uri\x18\x02 \x01(\t\x12\x11\n\tnext_link\x18\x03 \x01(\t\"*\n\x07\x42inding\x12\x10\n\x08variable\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t\"+\n\nBindingSet\x12\x1d\n\x06values\x18\x01 \x03(\x0b\x32\r.sage.Binding\"V\n\x0cSageResponse\x12\"\n\x08\x62indings\x18\x01 \x03(\x0b\x32\x10.sage.BindingSet\x12\x0f\n\x07is_done\x18\x02 \x01(\x08\x12\x11\n\tnext_link\x18\x03 \x01(\t2<\n\nSageSPARQL\x12.\n\x05Query\x12\x0f.sage.SageQuery\x1a\x12.sage.SageResponse\"\x00\x42,\n\x16\x66r.univnantes.gdd.sageB\nSageSPARQLP\x01\xa2\x02\x03HLWb\x06proto3')
+  serialized_pb=_b('\n\rservice.proto\x12\x04sage\"H\n\tSageQuery\x12\r\n\x05query\x18\x01 \x01(\t\x12\x19\n\x11\x64\x65\x66\x61ult_graph_uri\x18\x02 \x01(\t\x12\x11\n\tnext_link\x18\x03 \x01(\t\"*\n\x07\x42inding\x12\x10\n\x08variable\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t\"+\n\nBindingSet\x12\x1d\n\x06values\x18\x01 \x03(\x0b\x32\r.sage.Binding\"V\n\x0cSageResponse\x12\"\n\x08\x62indings\x18\x01 \x03(\x0b\x32\x10.sage.BindingSet\x12\x0f\n\x07is_done\x18\x02 \x01(\x08\x12\x11\n\tnext_link\x18\x03 \x01(\t2>\n\nSageSPARQL\x12\x30\n\x05Query\x12\x0f.sage.SageQuery\x1a\x12.sage.SageResponse\"\x00\x30\x01\x42,\n\x16\x66r.univnantes.gdd.sageB\nSageSPARQLP\x01\xa2\x02\x03HLWb\x06proto3')
 )
 
 
@@ -230,7 +230,7 @@ _SAGESPARQL = _descriptor.ServiceDescriptor(
   index=0,
   serialized_options=None,
   serialized_start=274,
-  serialized_end=334,
+  serialized_end=336,
   methods=[
   _descriptor.MethodDescriptor(
     name='Query',
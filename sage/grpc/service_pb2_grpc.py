@@ -14,7 +14,7 @@ class SageSPARQLStub(object):
     Args:
       channel: A grpc.Channel.
     """
-    self.Query = channel.unary_unary(
+    self.Query = channel.unary_stream(
         '/sage.SageSPARQL/Query',
         request_serializer=service__pb2.SageQuery.SerializeToString,
         response_deserializer=service__pb2.SageResponse.FromString,
@@ -26,7 +26,9 @@ class SageSPARQLServicer(object):
   """
 
   def Query(self, request, context):
-    """Execute a SPARQL query using the Web preemption model
+    """Execute a SPARQL query using the Web preemption model.
+    Results are streamed as a sequence of SageResponse chunks: only the last chunk
+    carries the is_done flag and the next_link of the query.
     """
     context.set_code(grpc.StatusCode.UNIMPLEMENTED)
     context.set_details('Method not implemented!')
@@ -35,7 +37,7 @@ class SageSPARQLServicer(object):
 
 def add_SageSPARQLServicer_to_server(servicer, server):
   rpc_method_handlers = {
-      'Query': grpc.unary_unary_rpc_method_handler(
+      'Query': grpc.unary_stream_rpc_method_handler(
           servicer.Query,
           request_deserializer=service__pb2.SageQuery.FromString,
           response_serializer=service__pb2.SageResponse.SerializeToString,
@@ -1,9 +1,13 @@
 # responses.py
 # Author: Thomas MINIER - MIT License 2017-2020
-from json import dumps
 from typing import Dict, Iterable, List, Optional, Tuple
 from xml.etree import ElementTree
 
+from orjson import dumps
+
+# Minimum size (in bytes) of the chunks yielded when streaming results
+CHUNK_SIZE = 64 * 1024
+
 
 def analyze_term(value: str) -> Tuple[str, str, Optional[str], Optional[str]]:
     """Analyze a RDF term and extract various information about it.
@@ -47,24 +51,25 @@ def analyze_term(value: str) -> Tuple[str, str, Optional[str], Optional[str]]:
         return value, "uri", None, None
 
 
-def stream_json_list(iterator: Iterable[Dict[str, str]]) -> Iterable[str]:
+def stream_json_list(iterator: Iterable[Dict[str, str]], buffer: bytearray) -> Iterable[bytes]:
     """A generator for streaming a list of JSON results in an HTTP response.
+
+    Results are appended to a buffer, which is flushed each time it holds at least `CHUNK_SIZE` bytes.
+    The remaining content of the buffer is left to the caller, so it can be completed before being sent.
     
-    Argument: An iterator which yields solutions bindings.
+    Args:
+      * iterator: An iterator which yields solutions bindings.
+      * buffer: Buffer that holds the pending content of the HTTP response.
 
-    Yields: Solution bindings as string-encoded JSON.
+    Yields: Chunks of the HTTP response, as UTF-8 encoded JSON.
     """
-    try:
-        # get first result
-        prev_binding = next(iterator)
-        for b in iterator:
-            yield dumps(prev_binding, separators=(',', ':')) + ','
-            prev_binding = b
-        # Now yield the last iteration without comma but with the closing brackets
-        yield dumps(prev_binding, separators=(',', ':'))
-    except StopIteration:
-        # StopIteration here means the length was zero, so yield a valid releases doc and stop
-        pass
+    for index, binding in enumerate(iterator):
+        if index > 0:
+            buffer += b","
+        buffer += dumps(binding)
+        if len(buffer) >= CHUNK_SIZE:
+            yield bytes(buffer)
+            buffer.clear()
 
 
 def skolemize_one(bnode: str, url: str) -> str:
@@ -132,8 +137,10 @@ def binding_to_json(binding: Dict[str, str]) -> dict:
     return json_binding
 
 
-def w3c_json_streaming(bindings: Iterable[Dict[str, str]], next_link: Optional[str], stats: dict, skol_url: str) -> Iterable[str]:
+def w3c_json_streaming(bindings: Iterable[Dict[str, str]], next_link: Optional[str], stats: dict, skol_url: str) -> Iterable[bytes]:
     """Yield a page of SaGe results in the W3C SPARQL JSON results format, so it can be sent in an HTTP response.
+
+    Results are buffered and yielded by chunks of at least `CHUNK_SIZE` bytes, rather than one binding at a time.
     
     Args:
       * bindings: An iterable which yields set of solution bindings.
@@ -142,25 +149,28 @@ def w3c_json_streaming(bindings: Iterable[Dict[str, str]], next_link: Optional[s
       * skol_url: URL used for the skolemization of blank nodes.
     
     Yields:
-      A page of SaGe results in the W3C SPARQL JSON results format.
+      A page of SaGe results in the W3C SPARQL JSON results format, as UTF-8 encoded chunks.
     """
     hasNext = "true" if next_link is not None else "false"
-    vars = list(map(lambda x: x[1:], bindings[0].keys()))
+    vars = list(map(lambda x: x[1:], bindings[0].keys())) if len(bindings) > 0 else list()
     # generate headers
-    yield "{\"head\":{\"vars\":["
-    yield ",".join(map(lambda x: f"\"{x}\"", vars))
-    yield f"],\"pageSize\":{len(bindings)},\"hasNext\":{hasNext},"
+    buffer = bytearray(b"{\"head\":{\"vars\":[")
+    buffer += ",".join(map(lambda x: f"\"{x}\"", vars)).encode("utf-8")
+    buffer += f"],\"pageSize\":{len(bindings)},\"hasNext\":{hasNext},".encode("utf-8")
     if next_link is not None:
-        yield f"\"next\":\"{next_link}\","
-    yield "\"stats\":" + dumps(stats, separators=(',', ':')) + "},\"results\":{\"bindings\":["
+        buffer += f"\"next\":\"{next_link}\",".encode("utf-8")
+    buffer += b"\"stats\":" + dumps(stats) + b"},\"results\":{\"bindings\":["
     # generate results
     b_iter = map(binding_to_json, skolemize(bindings, skol_url))
-    yield from stream_json_list(b_iter)
-    yield "]}}"
+    yield from stream_json_list(b_iter, buffer)
+    buffer += b"]}}"
+    yield bytes(buffer)
 
 
-def raw_json_streaming(bindings: Iterable[Dict[str, str]], next_link: Optional[str], stats: dict, skol_url: str) -> Iterable[str]:
+def raw_json_streaming(bindings: Iterable[Dict[str, str]], next_link: Optional[str], stats: dict, skol_url: str) -> Iterable[bytes]:
     """Yield a page of SaGe results in a non-standard JSON format, so it can be sent in an HTTP response.
+
+    Results are buffered and yielded by chunks of at least `CHUNK_SIZE` bytes, rather than one binding at a time.
     
     Args:
       * bindings: An iterable which yields set of solution bindings.
@@ -169,18 +179,19 @@ def raw_json_streaming(bindings: Iterable[Dict[str, str]], next_link: Optional[s
       * skol_url: URL used for the skolemization of blank nodes.
     
     Yields:
-      A page of SaGe results in the W3C SPARQL JSON results format.
+      A page of SaGe results in the W3C SPARQL JSON results format, as UTF-8 encoded chunks.
     """
     hasNext = "true" if next_link is not None else "false"
-    yield "{\"bindings\":["
+    buffer = bytearray(b"{\"bindings\":[")
     b_iter = skolemize(bindings, skol_url)
-    yield from stream_json_list(b_iter)
-    yield f"],\"pageSize\":{len(bindings)},\"hasNext\":{hasNext},"
+    yield from stream_json_list(b_iter, buffer)
+    buffer += f"],\"pageSize\":{len(bindings)},\"hasNext\":{hasNext},".encode("utf-8")
     if next_link is not None:
-        yield f"\"next\":\"{next_link}\","
+        buffer += f"\"next\":\"{next_link}\",".encode("utf-8")
     else:
-        yield "\"next\":null,"
-    yield "\"stats\":" + dumps(stats, separators=(',', ':')) + "}"
+        buffer += b"\"next\":null,"
+    buffer += b"\"stats\":" + dumps(stats) + b"}"
+    yield bytes(buffer)
 
 
 def bindings_to_w3c_xml(bindings: Iterable[Dict[str, str]], skol_url: str) -> ElementTree.Element:
@@ -208,7 +219,7 @@ def bindings_to_w3c_xml(bindings: Iterable[Dict[str, str]], skol_url: str) -> El
                     literal_node.set(extra_label, extra_value)
         return result_node
 
-    vars = list(map(lambda x: x[1:], bindings[0].keys()))
+    vars = list(map(lambda x: x[1:], bindings[0].keys())) if len(bindings) > 0 else list()
     root = ElementTree.Element("sparql", xmlns="http://www.w3.org/2005/sparql-results#")
     # build head
     head = ElementTree.SubElement(root, "head")
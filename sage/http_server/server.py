@@ -1,11 +1,11 @@
 # server.py
 # Author: Thomas MINIER - MIT License 2017-2020
 import logging
+from functools import lru_cache
+from secrets import token_urlsafe
 from sys import setrecursionlimit
-from time import time
+from time import perf_counter_ns
 from typing import Dict, List, Optional, Tuple
-from urllib.parse import urlunparse
-from uuid import uuid4
 
 from fastapi import FastAPI, HTTPException, Query
 from pydantic import BaseModel, Field
@@ -16,6 +16,7 @@ from starlette.responses import (JSONResponse, RedirectResponse, Response,
 
 import sage.http_server.responses as responses
 from sage.database.core.dataset import Dataset
+from sage.database.core.graph import Graph
 from sage.database.core.yaml_config import load_config
 from sage.database.descriptors import VoidDescriptor, many_void
 from sage.http_server.utils import decode_saved_plan, encode_saved_plan
@@ -23,12 +24,52 @@ from sage.query_engine.iterators.loader import load
 from sage.query_engine.optimizer.query_parser import parse_query
 from sage.query_engine.sage_engine import SageEngine
 
+# the SageEngine is stateless, so all queries are executed by the same instance
+ENGINE = SageEngine()
+
 
 class SagePostQuery(BaseModel):
     """Data model for the body of POST SPARQL queries"""
     query: str = Field(..., description="The SPARQL query to execute.")
     defaultGraph: str = Field(..., description="The URI of the default RDF graph queried.")
-    next: str = Field(None, description="(Optional) A next link used to resume query execution from a saved state.")
+    next: Optional[str] = Field(None, description="(Optional) A next link used to resume query execution from a saved state.")
+
+def get_server_url(request: Request) -> str:
+    """Get the URL targeted by an HTTP request, without its query string and fragment.
+
+    Argument: The HTTP request.
+
+    Returns: The URL targeted by the request.
+    """
+    url = request.url
+    return f"{url.scheme}://{url.netloc}{url.path}"
+
+@lru_cache(maxsize=256)
+def parse_accept_header(accept: str) -> Tuple[str, ...]:
+    """Parse the value of an HTTP Accept header into a list of mimetypes, sorted by preference.
+
+    Mimetypes are sorted by decreasing quality value, and mimetypes with the same quality value keep the order of the header.
+    Clients tend to send the same Accept header with every request, so parsed headers are cached.
+
+    Argument: Value of the HTTP Accept header.
+
+    Returns: The mimetypes accepted by the client, without their parameters, from the most to the least preferred one.
+    """
+    mimetypes = list()
+    for media_range in accept.split(","):
+        mimetype, *params = media_range.split(";")
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    pass
+        # a quality value of 0 means "not acceptable"
+        if len(mimetype.strip()) > 0 and quality > 0:
+            mimetypes.append((mimetype.strip(), quality))
+    return tuple(mimetype for mimetype, _ in sorted(mimetypes, key=lambda m: m[1], reverse=True))
 
 def choose_void_format(mimetypes):
     if "text/turtle" in mimetypes:
@@ -43,6 +84,38 @@ def choose_void_format(mimetypes):
         return "json-ld", "application/json"
     return "ntriples", "application/n-triples"
 
+@lru_cache(maxsize=128)
+def describe_graph(url: str, graph: Graph, void_format: str) -> str:
+    """Describe a RDF Graph hosted by the SaGe server using the VoID vocabulary.
+
+    VoID descriptions are built from the configuration of the graph, so they are computed once per URL and format, then cached.
+
+    Args:
+      * url: URL of the SaGe server.
+      * graph: RDF Graph to describe.
+      * void_format: RDF serialization format of the description.
+
+    Returns:
+      The VoID description of the RDF Graph, in the given format.
+    """
+    return VoidDescriptor(url, graph).describe(void_format)
+
+@lru_cache(maxsize=128)
+def describe_dataset(url: str, dataset: Dataset, void_format: str) -> str:
+    """Describe all RDF Graphs hosted by the SaGe server using the VoID and SPARQL Description vocabularies.
+
+    Like VoID descriptions of RDF graphs, the description of the server is computed once per URL and format, then cached.
+
+    Args:
+      * url: URL of the SaGe server.
+      * dataset: RDF dataset hosted by the SaGe server.
+      * void_format: RDF serialization format of the description.
+
+    Returns:
+      The description of the RDF dataset, in the given format.
+    """
+    return many_void(url, dataset, void_format)
+
 async def execute_query(query: str, default_graph_uri: str, next_link: Optional[str], dataset: Dataset) -> Tuple[List[Dict[str, str]], Optional[str], Dict[str, str]]:
     """Execute a query using the SageEngine and returns the appropriate HTTP response.
     
@@ -62,65 +135,83 @@ async def execute_query(query: str, default_graph_uri: str, next_link: Optional[
     
     Throws: Any exception that have occured during query execution.
     """
-    graph = None
-    try:
-        if not dataset.has_graph(default_graph_uri):
-            raise HTTPException(status_code=404, detail=f"RDF Graph {default_graph_uri} not found on the server.")
-        graph = dataset.get_graph(default_graph_uri)
+    graph = dataset.get_graph(default_graph_uri)
+    if graph is None:
+        raise HTTPException(status_code=404, detail=f"RDF Graph {default_graph_uri} not found on the server.")
 
+    # any failure aborts the ongoing transactions, and the exception is forwarded to the main loop
+    with graph.transaction():
         # decode next_link or build query execution plan
         cardinalities = dict()
-        start = time()
+        start = perf_counter_ns()
         if next_link is not None:
             if dataset.is_stateless:
-                saved_plan = next_link
+                saved_plan = decode_saved_plan(next_link)
             else:
                 saved_plan = dataset.statefull_manager.get_plan(next_link)
-            plan = load(decode_saved_plan(saved_plan), dataset)
+            plan = load(saved_plan, dataset)
         else:
             plan, cardinalities = parse_query(query, dataset, default_graph_uri)
-        loading_time = (time() - start) * 1000
+        loading_time = (perf_counter_ns() - start) / 1e6
 
         # execute query
-        engine = SageEngine()
         quota = graph.quota / 1000
         max_results = graph.max_results
-        bindings, saved_plan, is_done, abort_reason = await engine.execute(plan, quota, max_results)
+        bindings, saved_plan, is_done, abort_reason = await ENGINE.execute(plan, quota, max_results)
 
-        # commit or abort (if necessary)
+        # abort (if necessary)
         if abort_reason is not None:
-            graph.abort()
             raise HTTPException(status_code=500, detail=f"The SPARQL query has been aborted for the following reason: '{abort_reason}'")
-        else:
-            graph.commit()
 
-        start = time()
-        # encode saved plan if query execution is not done yet and there was no abort
+        start = perf_counter_ns()
+        # encode saved plan if query execution is not done yet
         next_page = None
-        if (not is_done) and abort_reason is None:
-            next_page = encode_saved_plan(saved_plan)
-            if not dataset.is_stateless:
+        if not is_done:
+            if dataset.is_stateless:
+                next_page = encode_saved_plan(saved_plan)
+            else:
                 # generate the plan ID if this is the first time we execute this plan
-                plan_id = next_link if next_link is not None else str(uuid4())
-                dataset.statefull_manager.save_plan(plan_id, next_page)
+                plan_id = next_link if next_link is not None else token_urlsafe(16)
+                # saved plans never leave the server in statefull mode, so they are stored without base64 encoding
+                dataset.statefull_manager.save_plan(plan_id, saved_plan.SerializeToString())
                 next_page = plan_id
-        elif is_done and (not dataset.is_stateless) and next_link is not None:
+        elif (not dataset.is_stateless) and next_link is not None:
             # delete the saved plan, as it will not be reloaded anymore
             dataset.statefull_manager.delete_plan(next_link)
 
-        exportTime = (time() - start) * 1000
+        exportTime = (perf_counter_ns() - start) / 1e6
         stats = {"cardinalities": cardinalities, "import": loading_time, "export": exportTime}
 
-        return (bindings, next_page, stats)
-    except Exception as err:
-        # abort all ongoing transactions, then forward the exception to the main loop
-        if graph is not None:
-            graph.abort()
-        raise err
+    return (bindings, next_page, stats)
+
+def raw_json_response(bindings: List[Dict[str, str]], next_page: Optional[str], stats: dict, skol_url: str) -> Response:
+    """Create an HTTP response with SPARQL query results in the SaGe JSON format"""
+    iterator = responses.raw_json_streaming(bindings, next_page, stats, skol_url)
+    return StreamingResponse(iterator, media_type="application/json")
 
-def create_response(mimetypes: List[str], bindings: List[Dict[str, str]], next_page: Optional[str], stats: dict, skol_url: str) -> Response:
+def w3c_json_response(bindings: List[Dict[str, str]], next_page: Optional[str], stats: dict, skol_url: str) -> Response:
+    """Create an HTTP response with SPARQL query results in the W3C SPARQL JSON results format"""
+    iterator = responses.w3c_json_streaming(bindings, next_page, stats, skol_url)
+    return StreamingResponse(iterator, media_type="application/json")
+
+def w3c_xml_response(bindings: List[Dict[str, str]], next_page: Optional[str], stats: dict, skol_url: str) -> Response:
+    """Create an HTTP response with SPARQL query results in the W3C SPARQL XML results format"""
+    page = responses.w3c_xml(bindings, next_page, stats, skol_url)
+    return Response(page, media_type="application/xml")
+
+# Builders of HTTP responses for SPARQL query results, indexed by supported mimetypes
+RESPONSE_BUILDERS = {
+    "application/json": raw_json_response,
+    "application/sparql-results+json": w3c_json_response,
+    "application/xml": w3c_xml_response,
+    "application/sparql-results+xml": w3c_xml_response
+}
+
+def create_response(mimetypes: Tuple[str, ...], bindings: List[Dict[str, str]], next_page: Optional[str], stats: dict, skol_url: str) -> Response:
     """Create an HTTP response for the results of SPARQL query execution.
 
+    The response is built using the first supported mimetype, in the order of the input mimetypes.
+
     Args:
       * mimetypes: mimetypes from the input HTTP request.
       * bindings: list of query results.
@@ -131,15 +222,9 @@ def create_response(mimetypes: List[str], bindings: List[Dict[str, str]], next_p
     Returns:
       An HTTP response built from the input mimetypes and the SPARQL query results.
     """
-    if "application/json" in mimetypes:
-        iterator = responses.raw_json_streaming(bindings, next_page, stats, skol_url)
-        return StreamingResponse(iterator, media_type="application/json")
-    elif "application/sparql-results+json" in mimetypes:
-        iterator = responses.w3c_json_streaming(bindings, next_page, stats, skol_url)
-        return StreamingResponse(iterator, media_type="application/json")
-    elif "application/xml" in mimetypes or "application/sparql-results+xml" in mimetypes:
-        iterator = responses.w3c_xml(bindings, next_page, stats)
-        return Response(iterator, media_type="application/xml")
+    for mimetype in mimetypes:
+        if mimetype in RESPONSE_BUILDERS:
+            return RESPONSE_BUILDERS[mimetype](bindings, next_page, stats, skol_url)
     return JSONResponse({
         "bindings": bindings,
         "next": next_page,
@@ -184,8 +269,8 @@ def run_app(config_file: str) -> FastAPI:
     ):
         """Execute a SPARQL query using the Web Preemption model"""
         try:
-            mimetypes = request.headers['accept'].split(",")
-            server_url = urlunparse(request.url.components[0:3] + (None, None, None))
+            mimetypes = parse_accept_header(request.headers.get("accept", "*/*"))
+            server_url = get_server_url(request)
             bindings, next_page, stats = await execute_query(query, default_graph_uri, next_link, dataset)
             return create_response(mimetypes, bindings, next_page, stats, server_url)
         except HTTPException as err:
@@ -199,8 +284,8 @@ def run_app(config_file: str) -> FastAPI:
     async def sparql_post(request: Request, item: SagePostQuery):
         """Execute a SPARQL query using the Web Preemption model"""
         try:
-            mimetypes = request.headers['accept'].split(",")
-            server_url = urlunparse(request.url.components[0:3] + (None, None, None))
+            mimetypes = parse_accept_header(request.headers.get("accept", "*/*"))
+            server_url = get_server_url(request)
             bindings, next_page, stats = await execute_query(item.query, item.defaultGraph, item.next, dataset)
             return create_response(mimetypes, bindings, next_page, stats, server_url)
         except HTTPException as err:
@@ -213,13 +298,12 @@ def run_app(config_file: str) -> FastAPI:
     async def server_void(request: Request):
         """Describe all RDF datasets hosted by the Sage endpoint"""
         try:
-            mimetypes = request.headers['accept'].split(",")
-            url = urlunparse(request.url.components[0:3] + (None, None, None))
+            mimetypes = parse_accept_header(request.headers.get("accept", "*/*"))
+            url = get_server_url(request)
             if url.endswith('/'):
                 url = url[0:len(url) - 1]
             void_format, res_mimetype = choose_void_format(mimetypes)
-            description = many_void(url, dataset, void_format)
-            return Response(description, media_type=res_mimetype)
+            return Response(describe_dataset(url, dataset, void_format), media_type=res_mimetype)
         except Exception as err:
             logging.error(err)
             raise HTTPException(status_code=500, detail=str(err))
@@ -236,13 +320,12 @@ def run_app(config_file: str) -> FastAPI:
         if graph is None:
             raise HTTPException(status_code=404, detail=f"RDF Graph {graph_name} not found on the server.")
         try:
-            mimetypes = request.headers['accept'].split(",")
-            url = urlunparse(request.url.components[0:3] + (None, None, None))
+            mimetypes = parse_accept_header(request.headers.get("accept", "*/*"))
+            url = get_server_url(request)
             if url.endswith('/'):
                 url = url[0:len(url) - 1]
-            descriptor = VoidDescriptor(url, graph)
             void_format, res_mimetype = choose_void_format(mimetypes)
-            return Response(descriptor.describe(void_format), media_type=res_mimetype)
+            return Response(describe_graph(url, graph, void_format), media_type=res_mimetype)
         except Exception as err:
             logging.error(err)
             raise HTTPException(status_code=500, detail=str(err))
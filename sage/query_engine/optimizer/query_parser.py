@@ -2,6 +2,7 @@
 # Author: Thomas MINIER - MIT License 2017-2020
 from datetime import datetime
 from enum import Enum
+from functools import lru_cache
 from typing import Dict, Iterable, List, Optional, Tuple, Union
 
 import pyparsing
@@ -146,6 +147,22 @@ def parse_filter_expr(expr: dict) -> str:
         raise UnsupportedSPARQL(f"Unsupported SPARQL FILTER expression: {expr.name}")
 
 
+@lru_cache(maxsize=1000)
+def parse_logical_plan(query: str) -> dict:
+    """Parse a read-only SPARQL query into a logical query execution plan.
+
+    Logical plans only depend on the query text, so the plans of the last 1000 parsed queries are cached.
+    Physical plans cannot be cached, as they are stateful and depend on the current state of the RDF dataset.
+
+    Argument: SPARQL query to parse.
+
+    Returns: The logical query execution plan, in rdflib format.
+
+    Throws: `ParseException` if the input is not a valid read-only SPARQL query.
+    """
+    return translateQuery(parseQuery(query)).algebra
+
+
 def parse_query(query: str, dataset: Dataset, default_graph: str) -> Tuple[PreemptableIterator, dict]:
     """Parse a read-only SPARQL query into a physical query execution plan.
 
@@ -167,7 +184,7 @@ def parse_query(query: str, dataset: Dataset, default_graph: str) -> Tuple[Preem
     # rdflib has no tool for parsing both read and update query,
     # so we must rely on a try/catch dirty trick...
     try:
-        logical_plan = translateQuery(parseQuery(query)).algebra
+        logical_plan = parse_logical_plan(query)
         cardinalities = list()
         iterator = parse_query_node(logical_plan, dataset, [default_graph], cardinalities, as_of=start_timestamp)
         return iterator, cardinalities
@@ -0,0 +1,61 @@
+# graph_test.py
+# Author: Thomas MINIER - MIT License 2017-2020
+import pytest
+from sage.database.core.graph import Graph
+from tests.utils import MemoryDatabase
+
+
+class TransactionLogDatabase(MemoryDatabase):
+    """An in-memory RDF database that records how transactions are terminated"""
+
+    def __init__(self, fail_commit=False):
+        super(TransactionLogDatabase, self).__init__()
+        self._fail_commit = fail_commit
+        self.log = list()
+
+    def commit_transaction(self):
+        self.log.append('commit')
+        if self._fail_commit:
+            raise IOError('commit failed')
+
+    def abort_transaction(self):
+        self.log.append('abort')
+
+
+def test_transaction_commit():
+    connector = TransactionLogDatabase()
+    graph = Graph('http://localhost:8000/sparql/test', 'test', 'test graph', connector)
+    with graph.transaction():
+        graph.insert(':s', ':p', ':o')
+    assert connector.log == ['commit']
+
+
+def test_transaction_abort():
+    connector = TransactionLogDatabase()
+    graph = Graph('http://localhost:8000/sparql/test', 'test', 'test graph', connector)
+    with pytest.raises(ValueError):
+        with graph.transaction():
+            raise ValueError()
+    assert connector.log == ['abort']
+
+
+def test_transaction_abort_failed_commit():
+    connector = TransactionLogDatabase(fail_commit=True)
+    graph = Graph('http://localhost:8000/sparql/test', 'test', 'test graph', connector)
+    with pytest.raises(IOError):
+        with graph.transaction():
+            graph.insert(':s', ':p', ':o')
+    assert connector.log == ['commit', 'abort']
+
+
+def test_get_query():
+    queries = [
+        {'@id': 'q1', 'name': 'first query', 'value': 'SELECT * WHERE { ?s ?p ?o }'},
+        {'name': 'query without ID', 'value': 'SELECT * WHERE { ?s <http://example.org/p> ?o }'},
+        {'@id': 'q2', 'name': 'second query', 'value': 'SELECT * WHERE { ?s ?p <http://example.org/o> }'},
+        {'@id': 'q1', 'name': 'duplicated query', 'value': 'SELECT * WHERE { <http://example.org/s> ?p ?o }'}
+    ]
+    graph = Graph('http://localhost:8000/sparql/test', 'test', 'test graph', MemoryDatabase(), default_queries=queries)
+    assert graph.get_query('q1') == queries[0]
+    assert graph.get_query('q2') == queries[2]
+    assert graph.get_query('q3') is None
@@ -0,0 +1,59 @@
+# grpc_chunks_test.py
+# Author: Thomas MINIER - MIT License 2017-2020
+from math import inf
+
+import pytest
+from sage.database.core.dataset import Dataset
+from sage.database.core.graph import Graph
+from sage.grpc.grpc_server import SageQueryService
+from sage.grpc.service_pb2 import SageQuery
+from tests.utils import MemoryDatabase
+
+GRAPH_URI = 'http://localhost:8000/sparql/memory'
+
+QUERY = 'SELECT * WHERE { ?s <http://example.org/p> ?o }'
+
+# (number of triples in the graph, max. number of results per page, expected sizes of the chunks)
+chunks = [
+    (25, inf, [10, 10, 5]),
+    (30, inf, [10, 10, 10]),
+    (5, inf, [5]),
+    (0, inf, [0]),
+    (25, 20, [10, 10])
+]
+
+
+class AbortContext(object):
+    """A fake gRPC servicer context, which fails the query as soon as it is aborted"""
+
+    async def abort(self, code, details=''):
+        raise AssertionError(f"Query aborted with status {code}: {details}")
+
+
+def build_service(nb_triples, max_results, chunk_size):
+    connector = MemoryDatabase()
+    for i in range(nb_triples):
+        connector.insert(f"http://example.org/s{i}", "http://example.org/p", f"http://example.org/o{i}")
+    graph = Graph(GRAPH_URI, 'memory', 'in-memory graph', connector, max_results=max_results)
+    dataset = Dataset('test', 'test dataset', {GRAPH_URI: graph})
+    return SageQueryService(dataset, chunk_size=chunk_size)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("nb_triples,max_results,expected_sizes", chunks)
+async def test_query_chunks(nb_triples, max_results, expected_sizes):
+    service = build_service(nb_triples, max_results, 10)
+    responses = [response async for response in service.Query(SageQuery(query=QUERY, default_graph_uri=GRAPH_URI), AbortContext())]
+    assert [len(response.bindings) for response in responses] == expected_sizes
+    assert sum(len(response.bindings) for response in responses) == min(nb_triples, max_results)
+    # only the last chunk holds the state of the query execution
+    for response in responses[:-1]:
+        assert not response.is_done
+        assert response.next_link == ''
+    last_response = responses[-1]
+    if nb_triples > max_results:
+        assert not last_response.is_done
+        assert len(last_response.next_link) > 0
+    else:
+        assert last_response.is_done
+        assert last_response.next_link == ''
@@ -1,5 +1,8 @@
 # bgp_interface_test.py
 # Author: Thomas MINIER - MIT License 2017-2018
+from asyncio import new_event_loop, run_coroutine_threadsafe
+from threading import Thread
+
 import grpc
 import pytest
 from sage.grpc import service_pb2_grpc
@@ -39,12 +42,22 @@ bgp_queries = [
 class TestGRPCInterface(object):
     @classmethod
     def setup_class(self):
-      self._server = get_server('tests/data/test_config.yaml', workers=1)
-      self._server.start()
+      # run the gRPC AsyncIO server in a background event loop
+      async def start_server():
+        server = get_server('tests/data/test_config.yaml', workers=1)
+        await server.start()
+        return server
+      self._loop = new_event_loop()
+      self._thread = Thread(target=self._loop.run_forever, daemon=True)
+      self._thread.start()
+      self._server = run_coroutine_threadsafe(start_server(), self._loop).result()
 
     @classmethod
     def teardown_class(self):
-      self._server.stop(None)
+      run_coroutine_threadsafe(self._server.stop(None), self._loop).result()
+      self._loop.call_soon_threadsafe(self._loop.stop)
+      self._thread.join()
+      self._loop.close()
 
     @pytest.mark.parametrize("query,cardinality", bgp_queries)
     def test_grpc_interface(self, query, cardinality):
@@ -56,8 +69,8 @@ class TestGRPCInterface(object):
         is_done = False
         next_link = None
         while not is_done:
-            response = client.Query(grpc_query)
-            nbResults += len(response.bindings)
+            for response in client.Query(grpc_query):
+                nbResults += len(response.bindings)
             is_done = response.is_done
             next_link = response.next_link
             nbCalls += 1
@@ -0,0 +1,106 @@
+# response_formats_test.py
+# Author: Thomas MINIER - MIT License 2017-2020
+import pytest
+from sage.http_server.server import parse_accept_header, run_app
+from starlette.testclient import TestClient
+from tests.http.utils import get_sparql
+from xml.etree import ElementTree
+
+XML_NS = {"sparql": "http://www.w3.org/2005/sparql-results#"}
+
+BROWSER_ACCEPT = "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8"
+
+accept_headers = [
+    ("application/json", ("application/json",)),
+    ("application/sparql-results+xml, application/json", ("application/sparql-results+xml", "application/json")),
+    ("application/xml;q=0.1, application/json", ("application/json", "application/xml")),
+    ("application/xml;q=0.5, application/sparql-results+json;q=0.5, application/json;q=0.2", ("application/xml", "application/sparql-results+json", "application/json")),
+    ("application/xml;q=0, application/json", ("application/json",)),
+    (BROWSER_ACCEPT, ("text/html", "application/xhtml+xml", "application/xml", "*/*"))
+]
+
+xml_queries = [
+    ("""
+        SELECT * WHERE {
+            ?s <http://xmlns.com/foaf/age> <http://db.uwaterloo.ca/~galuc/wsdbm/AgeGroup3> .
+            ?s <http://schema.org/nationality> <http://db.uwaterloo.ca/~galuc/wsdbm/Country1> .
+            ?s <http://db.uwaterloo.ca/~galuc/wsdbm/gender> <http://db.uwaterloo.ca/~galuc/wsdbm/Gender1> .
+        }
+    """, 93),
+    ("""
+        SELECT * WHERE {
+            ?s <http://xmlns.com/foaf/age> ?s .
+        }
+    """, 0)
+]
+
+xml_mimetypes = ["application/sparql-results+xml", "application/xml", BROWSER_ACCEPT]
+
+# (Accept header, expected format of the response)
+dispatch_order = [
+    ("application/json, application/sparql-results+xml", "sage-json"),
+    ("application/sparql-results+xml, application/json", "xml"),
+    ("application/xml;q=0.1, application/json", "sage-json"),
+    ("application/sparql-results+json, application/json", "w3c-json"),
+    ("application/json;q=0.5, application/sparql-results+json", "w3c-json"),
+    ("text/html", "fallback-json")
+]
+
+
+@pytest.mark.parametrize("accept,expected", accept_headers)
+def test_parse_accept_header(accept, expected):
+    assert parse_accept_header(accept) == expected
+
+
+def test_parse_accept_header_cache():
+    parse_accept_header.cache_clear()
+    parse_accept_header("application/xml;q=0.1, application/json")
+    parse_accept_header("application/xml;q=0.1, application/json")
+    assert parse_accept_header.cache_info().hits == 1
+
+
+class TestResponseFormats(object):
+    @classmethod
+    def setup_class(self):
+        self._app = run_app('tests/data/test_config.yaml')
+        self._client = TestClient(self._app)
+
+    @classmethod
+    def teardown_class(self):
+        pass
+
+    @pytest.mark.parametrize("accept", xml_mimetypes)
+    @pytest.mark.parametrize("query,cardinality", xml_queries)
+    def test_xml_results(self, query, cardinality, accept):
+        nbResults = 0
+        hasNext = True
+        next_link = None
+        while hasNext:
+            response = get_sparql(self._client, query, next_link, 'http://testserver/sparql/watdiv100', accept)
+            assert response.status_code == 200
+            assert response.headers['content-type'].startswith('application/xml')
+            page = ElementTree.fromstring(response.text)
+            for result in page.findall("sparql:results/sparql:result", XML_NS):
+                assert len(result.findall("sparql:binding", XML_NS)) == 1
+            nbResults += len(page.findall("sparql:results/sparql:result", XML_NS))
+            hasNext = page.find("sparql:head/sparql:controls/sparql:hasNext", XML_NS).text == "True"
+            next_link = page.find("sparql:head/sparql:controls/sparql:next", XML_NS).text
+        assert nbResults == cardinality
+
+    @pytest.mark.parametrize("accept,expected_format", dispatch_order)
+    def test_dispatch_order(self, accept, expected_format):
+        query = xml_queries[0][0]
+        response = get_sparql(self._client, query, None, 'http://testserver/sparql/watdiv100', accept)
+        assert response.status_code == 200
+        if expected_format == "xml":
+            assert response.headers['content-type'].startswith('application/xml')
+            assert ElementTree.fromstring(response.text).find("sparql:head", XML_NS) is not None
+        else:
+            assert response.headers['content-type'].startswith('application/json')
+            content = response.json()
+            if expected_format == "sage-json":
+                assert 'bindings' in content and 'hasNext' in content
+            elif expected_format == "w3c-json":
+                assert 'head' in content and 'results' in content
+            else:
+                assert 'bindings' in content and 'hasNext' not in content
@@ -15,3 +15,18 @@ def post_sparql(client, query, next_link, graph_uri):
     )
     res = client.post('/sparql', json=query.dict(), headers=headers)
     return res
+
+
+def get_sparql(client, query, next_link, graph_uri, accept):
+    """Execute a GET SPARQL query using FastAPI TestClient, with a given Accept header"""
+    headers = {
+        "Accept": accept
+    }
+    params = {
+        "query": query.strip(),
+        "default-graph-uri": graph_uri
+    }
+    if next_link is not None:
+        params["next"] = next_link
+    res = client.get('/sparql', params=params, headers=headers)
+    return res
@@ -2,7 +2,7 @@
 # Author: Thomas MINIER - MIT License 2017-2018
 import pytest
 from sage.query_engine.sage_engine import SageEngine
-from sage.query_engine.optimizer.query_parser import parse_query
+from sage.query_engine.optimizer.query_parser import parse_logical_plan, parse_query
 from sage.database.hdt.connector import HDTFileConnector
 from tests.utils import DummyDataset
 import math
@@ -85,3 +85,17 @@ class TestQueryParser(object):
         iterator, cards = parse_query(query, dataset, 'watdiv100')
         assert len(cards) > 0
         assert iterator is not None
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("query,cardinality", queries)
+    async def test_cached_logical_plan(self, query, cardinality):
+        # the cached logical plan is shared between executions, so building a physical plan must never alter it
+        first_plan, _ = parse_query(query, dataset, 'watdiv100')
+        hits = parse_logical_plan.cache_info().hits
+        second_plan, _ = parse_query(query, dataset, 'watdiv100')
+        assert parse_logical_plan.cache_info().hits == hits + 1
+        first_results, _, first_done, _ = await engine.execute(first_plan, 10e7)
+        second_results, _, second_done, _ = await engine.execute(second_plan, 10e7)
+        assert first_done and second_done
+        assert len(first_results) == cardinality
+        assert sorted(map(lambda b: sorted(b.items()), first_results)) == sorted(map(lambda b: sorted(b.items()), second_results))